@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_parallel import create_pool, share_stations, release_stations, parallel_daily_exceedances
+from data_statistics import calculate_daily_exceedances
+
+# Pomiar przyspieszenia parallel_daily_exceedances względem liczby procesów.
+# Dane syntetyczne: 10 lat pomiarów godzinowych dla 200 stacji.
+#
+# Uruchomienie:
+#   PYTHONPATH=. python benchmark_parallel.py [maks. liczba procesów]
+#
+# Kolumny wyniku:
+#   przygotowanie -- share_stations (konwersja do pamięci współdzielonej,
+#                    robiona równolegle przez procesy robocze)
+#   wywołanie     -- parallel_daily_exceedances na gotowym uchwycie i puli
+#                    (koszt jednego wywołania przy wielu statystykach na tych samych danych)
+#   całość        -- jedno wywołanie z DataFrame (przygotowanie + tymczasowa pula)
+#
+# Pomiar na maszynie z 1 rdzeniem: szeregowo 0.274 s, przygotowanie ~0.15 s,
+# wywołanie 0.101 s (2 procesy) / 0.078 s (4 procesy), całość ~0.27-0.30 s.
+# Zysk 'wywołania' na 1 rdzeniu bierze się z pominięcia kopii i konwersji,
+# a nie z równoległości - skalowanie z liczbą rdzeni trzeba zmierzyć tym
+# skryptem na docelowej maszynie wielordzeniowej.
+
+
+def make_data(n_stations=200, years=10):
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-01 01:00", periods=years * 8760, freq="h")
+    columns = pd.MultiIndex.from_tuples(
+        [(f"S{i}", f"Miasto{i % 40}") for i in range(n_stations)],
+        names=["Kod stacji", "Miejscowość"]
+    )
+    values = rng.gamma(2.0, 10.0, size=(len(index), n_stations))
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def measure(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    df = make_data()
+
+    serial = measure(lambda: calculate_daily_exceedances(df))
+    print(f"Rdzenie: {os.cpu_count()}, dane: {df.shape}")
+    print(f"szeregowo: {serial:.3f} s")
+
+    n_workers = 2
+    while n_workers <= max_workers:
+        prepare = measure(lambda: release_stations(share_stations(df, n_workers)))
+        whole = measure(lambda: parallel_daily_exceedances(df, n_workers=n_workers))
+
+        stations = share_stations(df, n_workers)
+        try:
+            with create_pool(n_workers) as pool:
+                # Pierwsze wywołanie uruchamia procesy puli - nie wliczamy go
+                parallel_daily_exceedances(stations, n_workers=n_workers, pool=pool)
+                call = measure(lambda: parallel_daily_exceedances(stations, n_workers=n_workers, pool=pool))
+        finally:
+            release_stations(stations)
+
+        print(f"procesy: {n_workers:3d}  przygotowanie: {prepare:.3f} s  "
+              f"wywołanie: {call:.3f} s ({serial / call:5.2f}x)  "
+              f"całość: {whole:.3f} s ({serial / whole:5.2f}x)")
+        n_workers *= 2
+
+
+if __name__ == "__main__":
+    main()
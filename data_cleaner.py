@@ -1,16 +1,120 @@
+import re
+from datetime import date
+
 import pandas as pd
 import numpy as np
 
+# Etykiety wierszy z metadanymi w arkuszach GIOŚ i ich ujednolicone nazwy.
+# W 2018 roku wiersz z kodem stanowiska jest podpisany jako 'Czas pomiaru'.
+METADATA_LABELS = {
+    'Wskaźnik': 'Wskaźnik',
+    'Czas uśredniania': 'Czas uśredniania',
+    'Jednostka': 'Jednostka',
+    'Kod stanowiska': 'Kod stanowiska',
+    'Czas pomiaru': 'Kod stanowiska',
+}
+
+# Daty zapisane jako tekst (np. '2015-01-01 01:00:00')
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+
 def delete_rows(year, data_frame, tab_of_indexes):
-    for i in tab_of_indexes:
-        try:
-            data_frame.drop(i, inplace=True)
-            print(f"W tabeli {year} usunięto wiersz {i}")
-        except:
-            print(f"W tabeli {year} nie ma wiersza {i}, zatem pomijam usuwanie.")
+    """
+    Usuwa wiersze o podanych etykietach (jednym wywołaniem drop).
+    Etykiety, których nie ma w tabeli, są pomijane.
+    """
+    present = [i for i in tab_of_indexes if i in data_frame.index]
+    missing = [i for i in tab_of_indexes if i not in data_frame.index]
+
+    data_frame.drop(present, inplace=True)
+
+    for i in present:
+        print(f"W tabeli {year} usunięto wiersz {i}")
+    for i in missing:
+        print(f"W tabeli {year} nie ma wiersza {i}, zatem pomijam usuwanie.")
     return data_frame
 
 
+def _is_date(value):
+    if isinstance(value, (date, np.datetime64)):
+        return True
+    return isinstance(value, str) and bool(_DATE_PATTERN.match(value.strip()))
+
+
+def detect_sheet_layout(df_raw, max_rows=20):
+    """
+    Rozpoznaje układ arkusza GIOŚ wczytanego bez nagłówka (header=None)
+    na podstawie pierwszej kolumny pierwszych max_rows wierszy.
+
+    Zwraca:
+    (header_row, data_start) -- numer wiersza z kodami stacji
+    oraz numer pierwszego wiersza z pomiarami.
+    """
+    first_col = df_raw.iloc[:max_rows, 0].tolist()
+
+    data_start = next((i for i, value in enumerate(first_col) if _is_date(value)), None)
+    if data_start is None:
+        raise ValueError(f"Nie znaleziono wierszy z datami w pierwszych {max_rows} wierszach arkusza.")
+
+    # Wiersz nagłówka to ten z etykietą 'Kod stacji'; gdy jej nie ma,
+    # bierzemy ostatni wiersz przed danymi, który nie jest metadanymi
+    header_row = None
+    for i in range(data_start):
+        if str(first_col[i]).strip() == 'Kod stacji':
+            header_row = i
+            break
+    if header_row is None:
+        candidates = [i for i in range(data_start)
+                      if str(first_col[i]).strip() not in METADATA_LABELS]
+        if not candidates:
+            raise ValueError("Nie znaleziono wiersza nagłówka z kodami stacji.")
+        header_row = candidates[-1]
+
+    return header_row, data_start
+
+
+def split_sheet_metadata(df_raw, max_rows=20):
+    """
+    Dzieli surowy arkusz (wczytany z header=None) na dane pomiarowe
+    i tabelę metadanych stacji (wskaźnik, czas uśredniania, jednostka, kod stanowiska).
+    Wiersze z metadanymi są usuwane jednym cięciem, przed parsowaniem liczb.
+
+    Zwraca:
+    (df_data, df_station_meta) -- dane z datami w indeksie i kodami stacji w kolumnach
+    oraz metadane z kodami stacji w indeksie.
+    """
+    header_row, data_start = detect_sheet_layout(df_raw, max_rows)
+
+    header = df_raw.iloc[header_row]
+    index_name = str(header.iloc[0]).strip()
+    codes = [str(code).strip() for code in header.iloc[1:]]
+
+    # Metadane: wiersze między nagłówkiem a danymi, transponowane (stacja = wiersz)
+    meta_rows = df_raw.iloc[header_row + 1:data_start]
+    # Etykietę kanoniczną nadajemy tylko raz - gdy arkusz ma już np. 'Kod stanowiska',
+    # to 'Czas pomiaru' zostaje pod własną nazwą (bez zdublowanych kolumn)
+    labels = []
+    for label in meta_rows.iloc[:, 0]:
+        label = str(label).strip()
+        canonical = METADATA_LABELS.get(label, label)
+        labels.append(label if canonical in labels else canonical)
+    df_station_meta = pd.DataFrame(
+        meta_rows.iloc[:, 1:].to_numpy().T,
+        index=pd.Index(codes, name=index_name),
+        columns=labels
+    )
+
+    # Dane: jedno cięcie zamiast usuwania wierszy po kolei
+    data = df_raw.iloc[data_start:]
+    df_data = pd.DataFrame(
+        data.iloc[:, 1:].to_numpy(),
+        index=pd.Index(pd.to_datetime(data.iloc[:, 0]), name=index_name),
+        columns=codes
+    ).infer_objects()
+
+    return df_data, df_station_meta
+
+
 def normalize_dataframe(df):
     """
     Zamienia przecinki na kropki w całym DataFrame, próbuje konwertować na liczby.
@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Format zapisu czasu w bazie - tekst ISO sortuje się tak samo jak daty,
+# więc zapytania zakresowe (BETWEEN) działają na indeksie (stacja, czas)
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _measurement_batches(df, batch_size):
+    """
+    Zamienia szeroki DataFrame (kolumny = stacje) na partie krotek
+    (stacja, czas, wartość) bez pustych pomiarów.
+    Każda partia powstaje z batch_size kolejnych wierszy (chwil czasu),
+    więc w pamięci nigdy nie ma całej tabeli w formacie 'long'.
+    """
+    # Przy MultiIndex (Kod stacji, Miejscowość) bierzemy sam kod stacji
+    if isinstance(df.columns, pd.MultiIndex):
+        stations = df.columns.get_level_values(0).to_numpy()
+    else:
+        stations = df.columns.to_numpy()
+    n_cols = len(stations)
+
+    for start in range(0, len(df), batch_size):
+        block = df.iloc[start:start + batch_size].apply(pd.to_numeric, errors='coerce')
+        times = pd.to_datetime(block.index).strftime(TIME_FORMAT).to_numpy()
+
+        # Rozwinięcie bloku do formatu 'long' jednym ruchem (bez pętli po stacjach)
+        values = block.to_numpy(dtype=float)
+        station_col = np.tile(stations, len(block))
+        time_col = np.repeat(times, n_cols)
+        value_col = values.ravel()
+
+        mask = ~np.isnan(value_col)
+        yield list(zip(station_col[mask].tolist(), time_col[mask].tolist(), value_col[mask].tolist()))
+
+
+def export_to_sqlite(df, df_meta, db_path, batch_size=1000):
+    """
+    Zapisuje oczyszczone dane do lokalnej bazy SQLite.
+    Tworzy tabele:
+    - stations      -- metadane stacji (z df_meta),
+    - measurements  -- pomiary w formacie 'long' (stacja, czas, wartość),
+    - daily_means   -- średnie dobowe dla stacji,
+    - monthly_means -- średnie miesięczne dla stacji.
+
+    Eksport musi dostać dane godzinowe, czyli ramkę sprzed fix_midnight_dates -
+    po tej funkcji w indeksie są same daty (24 wiersze na dzień), które nadpisałyby
+    się w bazie. Powtórzony indeks jest zgłaszany jako błąd przed zapisem.
+
+    Baza jest budowana w pliku tymczasowym obok db_path i podmieniana dopiero
+    po udanym eksporcie - przerwany eksport nie psuje istniejącej bazy.
+
+    Argumenty:
+    df         -- połączony DataFrame (np. z combine_dataframes), kolumny = stacje
+    df_meta    -- dataframe z metadanymi (indeks lub kolumna 'Kod stacji')
+    db_path    -- ścieżka do pliku bazy
+    batch_size -- liczba wierszy df (chwil czasu) zamienianych i wstawianych w jednej partii
+
+    Zwraca:
+    Liczbę zapisanych pomiarów.
+    """
+    index = pd.to_datetime(df.index)
+    if index.has_duplicates:
+        raise ValueError(
+            "Powtórzone chwile czasu w indeksie - eksportuj dane godzinowe "
+            "(przed fix_midnight_dates), a nie ramkę z samymi datami."
+        )
+
+    db_path = os.fspath(db_path)
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(db_path)))
+    os.close(fd)
+
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            # Plik tymczasowy jest jednorazowy (przy błędzie i tak go usuwamy),
+            # więc dziennik transakcji nie jest potrzebny
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+
+            # Tabela stacji - resetujemy indeks, żeby 'Kod stacji' był zwykłą kolumną
+            df_meta.reset_index().to_sql('stations', conn, index=False)
+
+            conn.execute("""
+                CREATE TABLE measurements (
+                    station TEXT NOT NULL,
+                    time    TEXT NOT NULL,
+                    value   REAL NOT NULL
+                )
+            """)
+
+            # Wstawianie partiami - jedna transakcja, executemany zamiast pojedynczych INSERT
+            inserted = 0
+            with conn:
+                for batch in _measurement_batches(df, batch_size):
+                    conn.executemany('INSERT INTO measurements VALUES (?, ?, ?)', batch)
+                    inserted += len(batch)
+
+            # Indeksy zakładamy po imporcie - tak jest szybciej niż przy każdym INSERT.
+            # Indeks (stacja, czas) jest unikalny - jeden pomiar na stację i godzinę.
+            conn.executescript("""
+                CREATE UNIQUE INDEX idx_measurements_station_time ON measurements (station, time);
+                CREATE INDEX idx_stations_code ON stations ("Kod stacji");
+
+                CREATE TABLE daily_means AS
+                    SELECT station, substr(time, 1, 10) AS day,
+                           AVG(value) AS mean, COUNT(*) AS n
+                    FROM measurements
+                    GROUP BY station, day;
+                CREATE INDEX idx_daily_station_day ON daily_means (station, day);
+
+                CREATE TABLE monthly_means AS
+                    SELECT station, substr(time, 1, 7) AS month,
+                           AVG(value) AS mean, COUNT(*) AS n
+                    FROM measurements
+                    GROUP BY station, month;
+                CREATE INDEX idx_monthly_station_month ON monthly_means (station, month);
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+        # Podmiana pliku jest atomowa - czytelnicy widzą starą albo nową bazę
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    print(f"Zapisano {inserted} pomiarów do bazy {db_path}.")
+    return inserted
+
+
+def read_city_range(db_path, city, start, end):
+    """
+    Wczytuje z bazy pomiary dla wszystkich stacji danego miasta w zakresie czasu.
+
+    Argumenty:
+    db_path -- ścieżka do pliku bazy (utworzonego przez export_to_sqlite)
+    city    -- nazwa miejscowości (np. 'Warszawa')
+    start   -- początek zakresu (włącznie), np. '2024-01-01'
+    end     -- koniec zakresu (włącznie), np. '2024-12-31 23:59:59'
+
+    Zwraca:
+    DataFrame w układzie jak w potoku czyszczenia: indeks to czas,
+    kolumny to MultiIndex (Kod stacji, Miejscowość).
+    """
+    start = pd.to_datetime(start).strftime(TIME_FORMAT)
+    end = pd.to_datetime(end).strftime(TIME_FORMAT)
+
+    stations_query = """
+        SELECT "Kod stacji" FROM stations
+        WHERE "Miejscowość" = ?
+        ORDER BY "Kod stacji"
+    """
+    query = """
+        SELECT m.station, m.time, m.value
+        FROM stations AS s
+        JOIN measurements AS m ON m.station = s."Kod stacji"
+        WHERE s."Miejscowość" = ? AND m.time BETWEEN ? AND ?
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        codes = [row[0] for row in conn.execute(stations_query, (city,))]
+        df_long = pd.read_sql_query(query, conn, params=(city, start, end))
+    finally:
+        conn.close()
+
+    # Kolumny zawsze odpowiadają stacjom miasta z tabeli stations,
+    # także tym bez pomiarów w zakresie (same NaN)
+    columns = pd.MultiIndex.from_tuples([(code, city) for code in codes],
+                                        names=['Kod stacji', 'Miejscowość'])
+
+    if df_long.empty:
+        print(f"Brak danych dla {city} w zakresie {start} - {end}")
+        return pd.DataFrame(index=pd.DatetimeIndex([]), columns=columns, dtype=float)
+
+    df_long['time'] = pd.to_datetime(df_long['time'])
+
+    # Powrót do formatu 'wide' - pivot (a nie pivot_table) zgłasza błąd przy
+    # powtórzonym (stacja, czas) zamiast po cichu uśredniać
+    df_wide = df_long.pivot(index='time', columns='station', values='value')
+    df_wide = df_wide.reindex(columns=codes)
+    df_wide.columns = columns
+    df_wide.index.name = None
+
+    return df_wide
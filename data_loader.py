@@ -3,10 +3,14 @@ import requests
 import zipfile
 import io, os
 
+from data_cleaner import split_sheet_metadata
+
 gios_archive_url = "https://powietrze.gios.gov.pl/pjp/archives/downloadFile/"
 
 # funkcja do ściągania podanego archiwum
-def download_gios_archive(year, gios_id, filename):
+# układ arkusza (wiersz nagłówka i wiersze metadanych) jest rozpoznawany automatycznie,
+# przy return_station_meta=True zwracana jest też tabela metadanych stacji
+def download_gios_archive(year, gios_id, filename, return_station_meta=False):
     print(f"pobieram dane z roku {year}")
     # Pobranie archiwum ZIP do pamięci
     url = f"{gios_archive_url}{gios_id}"
@@ -22,13 +26,15 @@ def download_gios_archive(year, gios_id, filename):
         else:
             # wczytaj plik do pandas
             with z.open(filename) as f:
+                # przy błędzie wczytywania zwracamy None zamiast wyjątku o niezdefiniowanej zmiennej
+                df, df_station_meta = None, None
                 try:
-                    if year==2015:
-                        df = pd.read_excel(f, header=0, index_col=0)
-                    else:
-                        df = pd.read_excel(f, header=1, index_col=0)
+                    df_raw = pd.read_excel(f, header=None)
+                    df, df_station_meta = split_sheet_metadata(df_raw)
                 except Exception as e:
                     print(f"Błąd przy wczytywaniu {year}: {e}")
+    if return_station_meta:
+        return df, df_station_meta
     return df
 
 # Przykladowe użycie
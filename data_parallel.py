@@ -0,0 +1,369 @@
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import data_statistics
+
+# Równoległe liczenie statystyk z podziałem stacji na części.
+#
+# Dane trafiają raz do pamięci współdzielonej (share_stations): na początku
+# segmentu indeks czasu (int64), za nim macierz stacje x czas (float64, jedna
+# stacja = jeden ciągły wiersz). Zadania dla puli przekazują tylko nazwę segmentu
+# i numery stacji, więc przy wielu wywołaniach na tych samych danych
+# (share_stations + create_pool) proces główny nic nie kopiuje.
+
+# Ramki czekające na zapis do pamięci współdzielonej. Procesy robocze
+# uruchamiane przez fork dziedziczą ten słownik i same konwertują swoje kolumny.
+_SOURCES = {}
+
+
+def _split_into_shards(groups, n_shards):
+    """
+    Rozdziela grupy kolumn (listy pozycji) na n_shards części o podobnej liczbie kolumn.
+    Grupa (np. wszystkie stacje jednego miasta) zawsze trafia w całości do jednej części.
+    """
+    shards = [[] for _ in range(n_shards)]
+    sizes = [0] * n_shards
+
+    # Największe grupy najpierw - wtedy podział jest najbardziej równy
+    for group in sorted(groups, key=len, reverse=True):
+        smallest = sizes.index(min(sizes))
+        shards[smallest].extend(group)
+        sizes[smallest] += len(group)
+
+    # Sortujemy pozycje, żeby kolejność kolumn w części była taka jak w oryginale
+    return [sorted(shard) for shard in shards if shard]
+
+
+def _city_groups(columns):
+    """
+    Zwraca listę grup pozycji kolumn - jedna grupa na miasto (drugi poziom MultiIndexu).
+    """
+    groups = {}
+    for pos, col in enumerate(columns):
+        groups.setdefault(col[1], []).append(pos)
+    return list(groups.values())
+
+
+def _views(buf, n_rows, n_cols):
+    """
+    Widoki na segment: indeks czasu (int64) i macierz stacje x czas (float64).
+    """
+    index = np.ndarray((n_rows,), dtype=np.int64, buffer=buf)
+    data = np.ndarray((n_cols, n_rows), dtype=np.float64, buffer=buf, offset=8 * n_rows)
+    return index, data
+
+
+def _fill_columns(token, name, n_rows, n_cols, start, stop):
+    """
+    Konwertuje kolumny start..stop ramki z _SOURCES[token] na liczby
+    i zapisuje je od razu do pamięci współdzielonej.
+    """
+    df = _SOURCES[token]
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        _, data = _views(shm.buf, n_rows, n_cols)
+        for pos in range(start, stop):
+            column = pd.to_numeric(df.iloc[:, pos], errors='coerce')
+            data[pos] = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        del data
+    finally:
+        shm.close()
+
+
+def _n_workers(n_workers):
+    if n_workers is None:
+        return os.cpu_count() or 1
+    return n_workers
+
+
+def create_pool(n_workers=None):
+    """
+    Tworzy pulę procesów do wielokrotnego użycia w funkcjach parallel_*
+    (argument pool). Pulę zamyka wywołujący: pool.shutdown() lub blok with.
+    """
+    return ProcessPoolExecutor(max_workers=_n_workers(n_workers))
+
+
+def share_stations(df, n_workers=None):
+    """
+    Umieszcza dane stacji w pamięci współdzielonej (konwersja na liczby jak pd.to_numeric
+    z errors='coerce'). Tam, gdzie jest dostępny fork, kolumny konwertują równolegle
+    procesy robocze - każdy swój zakres - i od razu zapisują je do wspólnego bufora.
+
+    Argumenty:
+    df        -- DataFrame z danymi godzinowymi (kolumny = stacje, indeks = czas)
+    n_workers -- liczba procesów do konwersji (domyślnie liczba rdzeni)
+
+    Zwraca:
+    Słownik-uchwyt, który można podawać zamiast df do funkcji parallel_*.
+    Pamięć zwalnia release_stations.
+    """
+    n_workers = _n_workers(n_workers)
+    index = pd.to_datetime(df.index)
+    n_rows, n_cols = df.shape
+
+    shm = shared_memory.SharedMemory(create=True, size=max(8 * n_rows * (n_cols + 1), 1))
+    try:
+        index_view, _ = _views(shm.buf, n_rows, n_cols)
+        index_view[:] = index.asi8
+        del index_view
+
+        ranges = np.array_split(np.arange(n_cols), max(min(n_workers, n_cols), 1))
+        ranges = [(int(r[0]), int(r[-1]) + 1) for r in ranges if len(r)]
+
+        token = uuid.uuid4().hex
+        _SOURCES[token] = df
+        try:
+            if n_workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+                # Procesy powstają po rejestracji ramki, więc ją dziedziczą (copy-on-write)
+                context = multiprocessing.get_context('fork')
+                with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context) as fill_pool:
+                    futures = [fill_pool.submit(_fill_columns, token, shm.name, n_rows, n_cols, start, stop)
+                               for start, stop in ranges]
+                    for future in futures:
+                        future.result()
+            else:
+                for start, stop in ranges:
+                    _fill_columns(token, shm.name, n_rows, n_cols, start, stop)
+        finally:
+            del _SOURCES[token]
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+
+    return {
+        'shm': shm,
+        'name': shm.name,
+        'n_rows': n_rows,
+        'n_cols': n_cols,
+        'columns': df.columns,
+        'index_dtype': str(index.dtype),
+        'index_name': df.index.name,
+    }
+
+
+def release_stations(stations):
+    """
+    Zwalnia pamięć współdzieloną uchwytu z share_stations.
+    """
+    stations['shm'].close()
+    stations['shm'].unlink()
+
+
+def _stations_frame(stations, positions=None):
+    """
+    Buduje DataFrame z uchwytu (widok bez kopiowania dla ciągłego zakresu stacji).
+    Zwraca (df, segment) - segment trzeba zamknąć po usunięciu df.
+    """
+    shm = shared_memory.SharedMemory(name=stations['name'])
+    index_view, data = _views(shm.buf, stations['n_rows'], stations['n_cols'])
+    index = pd.DatetimeIndex(index_view.view(stations['index_dtype']).copy(),
+                             name=stations['index_name'])
+
+    if positions is None:
+        positions = np.arange(stations['n_cols'])
+    positions = np.asarray(positions)
+
+    if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+        # Ciągły zakres stacji - wycinek bez kopiowania
+        block = data[positions[0]:positions[-1] + 1]
+    else:
+        block = data[positions]
+
+    df = pd.DataFrame(block.T, index=index, columns=stations['columns'][positions], copy=False)
+    del index_view, data, block
+    return df, shm
+
+
+def _run_shard(stations, positions, func, kwargs):
+    """
+    Funkcja wykonywana w procesie roboczym: podłącza się do pamięci współdzielonej
+    i uruchamia funkcję obliczeniową na swoich stacjach.
+    """
+    df_shard, shm = _stations_frame(stations, positions)
+    try:
+        result = func(df_shard, **kwargs)
+        # Przed zamknięciem pamięci nie może zostać żadne odwołanie do bufora
+        del df_shard
+    finally:
+        shm.close()
+    return result
+
+
+def _map_shards(stations, shards, func, kwargs_per_shard, pool):
+    """
+    Uruchamia func na każdej części w puli. Do zadań trafia tylko opis segmentu
+    (bez obiektu SharedMemory) i numery stacji. Zwraca wyniki w kolejności części.
+    """
+    task_stations = {key: value for key, value in stations.items() if key != 'shm'}
+    futures = [pool.submit(_run_shard, task_stations, shard, func, kwargs)
+               for shard, kwargs in zip(shards, kwargs_per_shard)]
+    return [future.result() for future in futures]
+
+
+def _run_parallel(df, n_workers, pool, run):
+    """
+    Wspólna obsługa wejścia: df może być ramką albo uchwytem z share_stations,
+    pool - gotową pulą (nie jest zamykana) albo None (tworzymy tymczasową).
+    run(stations, pool) wykonuje właściwe obliczenia.
+    """
+    own_stations = not isinstance(df, dict)
+    stations = share_stations(df, n_workers) if own_stations else df
+    try:
+        if pool is not None:
+            return run(stations, pool)
+        with create_pool(n_workers) as own_pool:
+            return run(stations, own_pool)
+    finally:
+        if own_stations:
+            release_stations(stations)
+
+
+def _serial(df, func, *args):
+    """
+    Wywołanie wersji szeregowej - także dla uchwytu z share_stations.
+    """
+    if not isinstance(df, dict):
+        return func(df, *args)
+    frame, shm = _stations_frame(df)
+    try:
+        return func(frame.copy(), *args)
+    finally:
+        del frame
+        shm.close()
+
+
+def _columns(df):
+    return df['columns'] if isinstance(df, dict) else df.columns
+
+
+def parallel_daily_exceedances(df, threshold=15, n_workers=None, pool=None):
+    """
+    Równoległa wersja calculate_daily_exceedances.
+    Dzieli stacje na ciągłe zakresy, liczy każdy w osobnym procesie i skleja wyniki.
+
+    Argumenty:
+    df        -- DataFrame z danymi godzinowymi (kolumny = stacje)
+                 lub uchwyt z share_stations (przy wielu wywołaniach)
+    threshold -- norma dobowa
+    n_workers -- liczba części/procesów (domyślnie liczba rdzeni)
+    pool      -- pula z create_pool do ponownego użycia (domyślnie tymczasowa)
+
+    Zwraca:
+    Ten sam wynik co calculate_daily_exceedances.
+    """
+    n_workers = _n_workers(n_workers)
+    n_cols = len(_columns(df))
+    if n_workers <= 1 or n_cols <= 1:
+        return _serial(df, data_statistics.calculate_daily_exceedances, threshold)
+
+    # Każda stacja liczona niezależnie - ciągłe zakresy to wycinki bez kopiowania
+    shards = [r.tolist() for r in np.array_split(np.arange(n_cols), min(n_workers, n_cols))]
+    kwargs = [{'threshold': threshold}] * len(shards)
+
+    def run(stations, pool):
+        results = _map_shards(stations, shards, data_statistics._daily_exceedances_core,
+                              kwargs, pool)
+        return pd.concat(results, axis=1)
+
+    return _run_parallel(df, n_workers, pool, run)
+
+
+def parallel_monthly_city_stats(df, cities_list, years_list, n_workers=None, pool=None):
+    """
+    Równoległa wersja calculate_monthly_city_stats.
+    Wszystkie stacje jednego miasta trafiają do tej samej części.
+
+    Wersja szeregowa nie konwertuje danych na liczby, więc tutaj ramka musi
+    już być liczbowa (np. po normalize_dataframe) - inaczej TypeError.
+
+    Zwraca:
+    Ten sam słownik {(miasto, rok): seria} co calculate_monthly_city_stats.
+    """
+    if not isinstance(df, dict):
+        non_numeric = [col for col, dtype in df.dtypes.items()
+                       if not pd.api.types.is_numeric_dtype(dtype)]
+        if non_numeric:
+            raise TypeError(f"Kolumny nie są liczbowe (użyj normalize_dataframe): {non_numeric[:5]}")
+
+    n_workers = _n_workers(n_workers)
+    if n_workers <= 1:
+        return _serial(df, data_statistics.calculate_monthly_city_stats, cities_list, years_list)
+
+    # Liczymy tylko stacje z żądanych miast - reszta i tak zostałaby odrzucona
+    columns = _columns(df)
+    requested = [pos for pos, col in enumerate(columns) if col[1] in cities_list]
+    found_cities = {columns[pos][1] for pos in requested}
+
+    merged = {}
+    if requested:
+        groups = _city_groups(columns[requested])
+        # Pozycje w obrębie wybranych kolumn -> pozycje w całej ramce
+        shards = [[requested[pos] for pos in shard]
+                  for shard in _split_into_shards(groups, n_workers)]
+
+        # Każda część dostaje tylko miasta, które w niej są (bez fałszywych ostrzeżeń)
+        kwargs = []
+        for positions in shards:
+            shard_cities = {columns[pos][1] for pos in positions}
+            kwargs.append({
+                'cities_list': [city for city in cities_list if city in shard_cities],
+                'years_list': years_list,
+            })
+
+        # Ramkę przenosimy do pamięci współdzielonej tylko z żądanymi stacjami
+        if not isinstance(df, dict):
+            df = df.iloc[:, requested]
+            local = {pos: i for i, pos in enumerate(requested)}
+            shards = [[local[pos] for pos in shard] for shard in shards]
+
+        def run(stations, pool):
+            return _map_shards(stations, shards, data_statistics._monthly_city_stats_core,
+                               kwargs, pool)
+
+        for partial in _run_parallel(df, n_workers, pool, run):
+            merged.update(partial)
+
+    # Kolejność kluczy taka jak w wersji szeregowej (miasta, potem lata)
+    wynik = {}
+    for city in cities_list:
+        if city not in found_cities:
+            print(f"Ostrzeżenie: Brak kolumn dla miasta: {city}")
+            continue
+        for year in years_list:
+            if (city, year) in merged:
+                wynik[(city, year)] = merged[(city, year)]
+    return wynik
+
+
+def parallel_heatmap_data(df, years_list=[2014, 2019, 2024], n_workers=None, pool=None):
+    """
+    Równoległa wersja prepare_heatmap_data.
+    Wszystkie stacje jednego miasta trafiają do tej samej części.
+
+    Zwraca:
+    Ten sam DataFrame (rok, miesiac, Miejscowość, pm25) co prepare_heatmap_data.
+    """
+    n_workers = _n_workers(n_workers)
+    if n_workers <= 1:
+        return _serial(df, data_statistics.prepare_heatmap_data, years_list)
+
+    shards = _split_into_shards(_city_groups(_columns(df)), n_workers)
+    kwargs = [{'years_list': years_list}] * len(shards)
+
+    def run(stations, pool):
+        return _map_shards(stations, shards, data_statistics._heatmap_data_core, kwargs, pool)
+
+    results = _run_parallel(df, n_workers, pool, run)
+
+    # Wersja szeregowa zwraca wiersze posortowane po dacie, a potem po mieście
+    df_return = pd.concat(results, ignore_index=True)
+    df_return = df_return.sort_values(['rok', 'miesiac', 'Miejscowość'], kind='stable')
+    return df_return.reset_index(drop=True)
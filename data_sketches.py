@@ -0,0 +1,236 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+# Szkice kwantyli (typu DDSketch) do liczenia percentyli w jednym przebiegu po danych.
+#
+# Wartość v > 0 trafia do kubełka i = ceil(log_gamma(v)), gdzie gamma = (1 + alpha) / (1 - alpha).
+# Kubełek i obejmuje przedział (gamma^(i-1), gamma^i], a jako wynik zwracamy
+# 2 * gamma^i / (gamma + 1). Gwarancja błędu:
+#   |wynik - x_q| <= alpha * |x_q|,
+# gdzie x_q to dokładny kwantyl w wersji 'lower' (element o pozycji floor(q * (n - 1))
+# w posortowanych danych, jak np.quantile(..., method='lower')).
+# Zera są liczone dokładnie, wartości ujemne w osobnych (lustrzanych) kubełkach.
+#
+# Szkic to zwykły słownik, więc łatwo go zapisać do JSON-a, a scalanie szkiców
+# (np. z różnych lat lub fragmentów danych) to zsumowanie liczników - wynik
+# jest taki sam, jak gdyby wszystkie dane trafiły do jednego szkicu.
+
+DEFAULT_ALPHA = 0.01
+
+# Nazwy statystyk dobowych, dla których budujemy szkice
+DAILY_STATISTICS = {
+    'srednia_dobowa': 'mean',
+    'maks_dobowe': 'max',
+}
+
+
+def new_sketch(alpha=DEFAULT_ALPHA):
+    """
+    Tworzy pusty szkic o względnym błędzie alpha (np. 0.01 = 1%).
+    """
+    return {'alpha': alpha, 'count': 0, 'zero': 0, 'positive': {}, 'negative': {}}
+
+
+def _gamma(alpha):
+    return (1 + alpha) / (1 - alpha)
+
+
+def _add_to_store(store, indexes):
+    # Zliczamy kubełki jednym wywołaniem zamiast pętli po wartościach
+    keys, counts = np.unique(indexes, return_counts=True)
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        store[key] = store.get(key, 0) + count
+
+
+def add_values(sketch, values):
+    """
+    Dodaje do szkicu tablicę wartości (NaN są pomijane).
+    Zwraca ten sam (zmodyfikowany) szkic.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return sketch
+
+    log_gamma = math.log(_gamma(sketch['alpha']))
+
+    positive = values[values > 0]
+    negative = -values[values < 0]
+
+    _add_to_store(sketch['positive'], np.ceil(np.log(positive) / log_gamma).astype(int))
+    _add_to_store(sketch['negative'], np.ceil(np.log(negative) / log_gamma).astype(int))
+    sketch['zero'] += int((values == 0).sum())
+    sketch['count'] += int(values.size)
+
+    return sketch
+
+
+def merge_sketches(sketch_a, sketch_b):
+    """
+    Scala dwa szkice (muszą mieć to samo alpha). Zwraca nowy szkic.
+    """
+    if sketch_a['alpha'] != sketch_b['alpha']:
+        raise ValueError("Nie można scalić szkiców o różnym alpha.")
+
+    merged = new_sketch(sketch_a['alpha'])
+    for sketch in (sketch_a, sketch_b):
+        for store in ('positive', 'negative'):
+            for key, count in sketch[store].items():
+                merged[store][key] = merged[store].get(key, 0) + count
+        merged['zero'] += sketch['zero']
+        merged['count'] += sketch['count']
+    return merged
+
+
+def sketch_quantile(sketch, q):
+    """
+    Zwraca przybliżony kwantyl q (0 <= q <= 1) ze szkicu.
+    Błąd względny nie przekracza alpha (patrz opis na początku modułu).
+    Dla pustego szkicu zwraca NaN.
+    """
+    if sketch['count'] == 0:
+        return np.nan
+
+    gamma = _gamma(sketch['alpha'])
+    rank = math.floor(q * (sketch['count'] - 1))
+
+    # Kolejność rosnąca: ujemne (od największego modułu), zero, dodatnie
+    cumulative = 0
+    for key in sorted(sketch['negative'], reverse=True):
+        cumulative += sketch['negative'][key]
+        if cumulative > rank:
+            return -2 * gamma ** key / (gamma + 1)
+
+    cumulative += sketch['zero']
+    if cumulative > rank:
+        return 0.0
+
+    for key in sorted(sketch['positive']):
+        cumulative += sketch['positive'][key]
+        if cumulative > rank:
+            return 2 * gamma ** key / (gamma + 1)
+
+    return np.nan
+
+
+def _update_daily_sketches(sketches, df, alpha):
+    """
+    Liczy statystyki dobowe dla pełnych dni z df i dodaje je do szkiców
+    {(statystyka, stacja, rok): szkic}.
+    """
+    for stat_name, how in DAILY_STATISTICS.items():
+        daily = df.resample('D').agg(how)
+        years = daily.index.year
+
+        for col in daily.columns:
+            # Przy MultiIndex (Kod stacji, Miejscowość) kluczem jest kod stacji
+            station = col[0] if isinstance(col, tuple) else col
+            values = daily[col].to_numpy(dtype=float)
+
+            for year in np.unique(years):
+                key = (stat_name, station, int(year))
+                sketch = sketches.setdefault(key, new_sketch(alpha))
+                add_values(sketch, values[years == year])
+
+
+def stream_daily_sketches(chunks, alpha=DEFAULT_ALPHA):
+    """
+    Buduje szkice kwantyli statystyk dobowych (średnia, maksimum z godzin)
+    dla każdej stacji i roku w jednym przebiegu po kolejnych fragmentach danych.
+
+    Argumenty:
+    chunks -- fragmenty danych godzinowych w kolejności chronologicznej
+              (np. roczniki z data_dict), kolumny = stacje
+    alpha  -- względny błąd szkicu
+
+    Zwraca:
+    Słownik {(statystyka, stacja, rok): szkic}.
+    """
+    sketches = {}
+    pending = None
+
+    for chunk in chunks:
+        df = chunk.apply(pd.to_numeric, errors='coerce')
+        df.index = pd.to_datetime(df.index)
+        if pending is not None:
+            df = pd.concat([pending, df], axis=0)
+
+        if df.empty:
+            continue
+
+        # Ostatni dzień fragmentu może być niepełny - odkładamy go do następnego fragmentu
+        last_day = df.index.max().normalize()
+        pending = df[df.index >= last_day]
+        complete = df[df.index < last_day]
+
+        if not complete.empty:
+            _update_daily_sketches(sketches, complete, alpha)
+
+    if pending is not None and not pending.empty:
+        _update_daily_sketches(sketches, pending, alpha)
+
+    return sketches
+
+
+def merge_sketch_sets(sketches_a, sketches_b):
+    """
+    Scala dwa słowniki szkiców (np. policzone dla różnych lat lub na różnych maszynach).
+    """
+    # Zawsze nowe szkice - późniejsze add_values na wyniku nie zmienia wejść
+    merged = {}
+    for sketches in (sketches_a, sketches_b):
+        for key, sketch in sketches.items():
+            base = merged.get(key, new_sketch(sketch['alpha']))
+            merged[key] = merge_sketches(base, sketch)
+    return merged
+
+
+def yearly_percentiles(sketches, q=0.904):
+    """
+    Zwraca percentyle roczne ze szkiców.
+
+    Zwraca:
+    DataFrame z indeksem (statystyka, rok) i kolumnami = stacje.
+    """
+    records = {key: sketch_quantile(sketch, q) for key, sketch in sketches.items()}
+    if not records:
+        print("Brak szkiców do policzenia percentyli.")
+        return pd.DataFrame()
+
+    series = pd.Series(records)
+    series.index.names = ['statystyka', 'stacja', 'rok']
+
+    wynik = series.unstack('stacja').sort_index()
+    return wynik
+
+
+def sketches_to_json(sketches):
+    """
+    Zapisuje słownik szkiców do tekstu JSON.
+    """
+    records = []
+    for (stat_name, station, year), sketch in sketches.items():
+        records.append({
+            'statystyka': stat_name,
+            'stacja': station,
+            'rok': year,
+            'sketch': sketch,
+        })
+    return json.dumps(records)
+
+
+def sketches_from_json(text):
+    """
+    Odtwarza słownik szkiców z tekstu JSON (z sketches_to_json).
+    """
+    sketches = {}
+    for record in json.loads(text):
+        sketch = record['sketch']
+        # JSON zamienia klucze kubełków na napisy - przywracamy liczby
+        for store in ('positive', 'negative'):
+            sketch[store] = {int(key): count for key, count in sketch[store].items()}
+        sketches[(record['statystyka'], record['stacja'], record['rok'])] = sketch
+    return sketches
@@ -1,9 +1,10 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import math
 
+# matplotlib i seaborn są importowane dopiero w funkcjach plot_*,
+# żeby same obliczenia (np. w procesach roboczych) startowały szybko
+
 # Funkcje do zadania 2
 
 def calculate_monthly_city_stats(df, cities_list, years_list):
@@ -16,6 +17,14 @@ def calculate_monthly_city_stats(df, cities_list, years_list):
     # Konwersja indeksu na datetime (jeśli jeszcze nie jest)
     df_calc.index = pd.to_datetime(df_calc.index)
 
+    return _monthly_city_stats_core(df_calc, cities_list, years_list)
+
+
+def _monthly_city_stats_core(df_calc, cities_list, years_list):
+    """
+    Właściwe obliczenia dla calculate_monthly_city_stats,
+    bez kopii i konwersji (df_calc ma już indeks typu datetime).
+    """
     # Liczymy średnie miesięczne
     monthly_mean = df_calc.resample("ME").mean()
 
@@ -52,6 +61,8 @@ def plot_city_comparison(stats_dict):
     """
     Rysuje wykres liniowy dla przygotowanych statystyk.
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(15, 10))
 
     # Style wykresów
@@ -107,13 +118,21 @@ def prepare_heatmap_data(df, years_list=[2014, 2019, 2024]):
     df_calc = df_calc.apply(pd.to_numeric, errors='coerce')
     df_calc.index = pd.to_datetime(df_calc.index)
 
+    return _heatmap_data_core(df_calc, years_list)
+
+
+def _heatmap_data_core(df_calc, years_list):
+    """
+    Właściwe obliczenia dla prepare_heatmap_data,
+    bez kopii i konwersji (df_calc jest liczbowy i ma indeks typu datetime).
+    """
     # Średnie miesięczne (resample)
     monthly_mean = df_calc.resample("ME").mean()
 
     # Średnia dla miast (grupowanie po kolumnach)
     # level=1 oznacza drugi poziom MultiIndexu (czyli 'Miejscowość')
-    # axis=1 oznacza, że łączymy kolumny, a nie wiersze
-    city_means = monthly_mean.groupby(level=1, axis=1).mean()
+    # Transpozycja zamiast axis=1 (nowsze wersje pandas nie mają tego argumentu)
+    city_means = monthly_mean.T.groupby(level=1).mean().T
 
     # Filtrowanie lat
     mask_years = city_means.index.year.isin(years_list)
@@ -140,6 +159,9 @@ def plot_city_heatmaps(df_heatmap):
     Rysuje siatkę heatmap dla każdego miasta.
     Używa wspólnej skali kolorów dla wszystkich wykresów.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Lista unikalnych miast
     miejscowosci = df_heatmap['Miejscowość'].unique()
     n_cities = len(miejscowosci)
@@ -201,6 +223,14 @@ def calculate_daily_exceedances(df, threshold=15):
     # Upewniamy się, że indeks to daty
     df_calc.index = pd.to_datetime(df_calc.index)
 
+    return _daily_exceedances_core(df_calc, threshold)
+
+
+def _daily_exceedances_core(df_calc, threshold):
+    """
+    Właściwe obliczenia dla calculate_daily_exceedances,
+    bez kopii i konwersji (df_calc jest liczbowy i ma indeks typu datetime).
+    """
     # Średnie dobowe (zamiast groupby Rok/Dzień, używamy resample 'D' - Dzień kalendarzowy)
     dobowe = df_calc.resample('D').mean()
     
@@ -216,6 +246,7 @@ def plot_manual_bars(wynik, ranking_year, years_to_analyze):
     """
     Rysuje wykres słupkowy używając plt.bar i manualnych przesunięć (x - width itd.),
     """
+    import matplotlib.pyplot as plt
     
     # Pobieramy rok rankingowy
     if ranking_year not in wynik.index:
@@ -0,0 +1,159 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def aggregate_for_trend(df, freq='YE', by_city=False):
+    """
+    Przygotowuje szereg do analizy trendu: średnie roczne ('YE') lub miesięczne ('ME').
+
+    Argumenty:
+    df      -- DataFrame z danymi (indeks = czas, kolumny = stacje)
+    freq    -- 'YE' (średnie roczne) lub 'ME' (średnie miesięczne)
+    by_city -- jeśli True, uśrednia stacje w obrębie miasta (drugi poziom MultiIndexu)
+
+    Zwraca:
+    DataFrame ze średnimi (wiersze = okresy, kolumny = stacje lub miasta).
+    """
+    df_calc = df.apply(pd.to_numeric, errors='coerce')
+    df_calc.index = pd.to_datetime(df_calc.index)
+
+    df_agg = df_calc.resample(freq).mean()
+
+    if by_city:
+        # Transpozycja, żeby grupować kolumny po 'Miejscowość'
+        df_agg = df_agg.T.groupby(level=1).mean().T
+
+    return df_agg
+
+
+def _pairwise_stats(values, times):
+    """
+    Liczy statystykę S Manna-Kendalla, jej wariancję (z poprawką na remisy)
+    oraz nachylenia wszystkich par - dla wszystkich kolumn naraz.
+
+    Zamiast pętli po parach (i, j) indeksujemy od razu wszystkie pary (np.triu_indices)
+    i liczymy na tablicach (liczba par, k).
+
+    Zwraca:
+    (S, var_S, slopes) -- slopes ma kształt (liczba par, k), NaN dla par z brakami.
+    """
+    n = values.shape[0]
+    valid = ~np.isnan(values)
+
+    # Górny trójkąt: pary i < j
+    i_idx, j_idx = np.triu_indices(n, k=1)
+
+    diffs = values[j_idx] - values[i_idx]
+    pair_valid = valid[j_idx] & valid[i_idx]
+
+    # S = suma znaków różnic (pary z brakami liczą się jako 0)
+    s = np.where(pair_valid, np.sign(diffs), 0).sum(axis=0)
+
+    # Nachylenia par (dzielimy przez odległość w czasie)
+    dt = (times[j_idx] - times[i_idx])[:, None]
+    slopes = np.where(pair_valid, diffs / dt, np.nan)
+
+    # Wariancja S z poprawką na remisy:
+    # var = [n(n-1)(2n+5) - suma po grupach t(t-1)(2t+5)] / 18
+    # Suma po grupach to suma po elementach (t_i - 1)(2 t_i + 5),
+    # gdzie t_i to liczność grupy równych wartości, do której należy element.
+    n_valid = valid.sum(axis=0)
+    ties = (values[:, None, :] == values[None, :, :]).sum(axis=1)
+    tie_term = np.where(valid, (ties - 1) * (2 * ties + 5), 0).sum(axis=0)
+    var_s = (n_valid * (n_valid - 1) * (2 * n_valid + 5) - tie_term) / 18.0
+
+    return s, var_s, slopes
+
+
+def _decimal_years(index):
+    """
+    Zamienia indeks dat na czas w latach (np. 2024.5 dla lipca 2024),
+    żeby nachylenie było w jednostkach na rok.
+    Liczymy w pełnych miesiącach - dane są zagregowane miesięcznie lub rocznie.
+    """
+    index = pd.to_datetime(index)
+    return index.year + (index.month - 1) / 12
+
+
+def mann_kendall_sen(df_agg, alpha=0.05, seasonal=False):
+    """
+    Test trendu Manna-Kendalla i estymator nachylenia Sena dla każdej kolumny.
+
+    Argumenty:
+    df_agg   -- DataFrame ze średnimi (np. z aggregate_for_trend)
+    alpha    -- poziom istotności
+    seasonal -- jeśli True, wariant sezonowy (Hirsch): test liczony osobno
+                dla każdego miesiąca i sumowany (wymaga danych miesięcznych)
+
+    Zwraca:
+    DataFrame (wiersz = stacja/miasto) z kolumnami:
+    n, S, var_S, Z, p, nachylenie (na rok), trend.
+    """
+    df_calc = df_agg.apply(pd.to_numeric, errors='coerce')
+    values = df_calc.to_numpy(dtype=float)
+    times = np.asarray(_decimal_years(df_calc.index), dtype=float)
+
+    if seasonal:
+        # Każdy miesiąc to osobny szereg (np. wszystkie styczniowe średnie)
+        months = pd.to_datetime(df_calc.index).month
+        s = np.zeros(values.shape[1])
+        var_s = np.zeros(values.shape[1])
+        all_slopes = []
+        for month in np.unique(months):
+            mask = np.asarray(months == month)
+            s_m, var_m, slopes_m = _pairwise_stats(values[mask], times[mask])
+            s += s_m
+            var_s += var_m
+            all_slopes.append(slopes_m)
+        slopes = np.concatenate(all_slopes, axis=0)
+    else:
+        s, var_s, slopes = _pairwise_stats(values, times)
+
+    # Statystyka Z z poprawką na ciągłość
+    std_s = np.sqrt(var_s)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(s > 0, (s - 1) / std_s, np.where(s < 0, (s + 1) / std_s, 0.0))
+    z = np.where(var_s > 0, z, 0.0)
+
+    # Dwustronna wartość p z rozkładu normalnego: p = erfc(|Z| / sqrt(2))
+    p = np.array([math.erfc(abs(val) / math.sqrt(2)) for val in z])
+
+    # Mediana nachyleń (puste kolumny dają NaN)
+    slope = np.full(values.shape[1], np.nan)
+    has_pairs = ~np.all(np.isnan(slopes), axis=0)
+    slope[has_pairs] = np.nanmedian(slopes[:, has_pairs], axis=0)
+
+    trend = np.where(p < alpha, np.where(s > 0, 'rosnący', 'malejący'), 'brak')
+
+    return pd.DataFrame({
+        'n': (~np.isnan(values)).sum(axis=0),
+        'S': s,
+        'var_S': var_s,
+        'Z': z,
+        'p': p,
+        'nachylenie': slope,
+        'trend': trend,
+    }, index=df_calc.columns)
+
+
+def calculate_trends(df, freq='YE', by_city=False, seasonal=False, alpha=0.05):
+    """
+    Liczy trendy PM2.5 dla wszystkich stacji (lub miast) naraz.
+
+    Argumenty:
+    df       -- DataFrame z danymi (np. z combine_dataframes)
+    freq     -- 'YE' (średnie roczne) lub 'ME' (średnie miesięczne)
+    by_city  -- jeśli True, trend liczony dla średniej z miasta
+    seasonal -- wariant sezonowy (tylko dla freq='ME')
+    alpha    -- poziom istotności
+
+    Zwraca:
+    DataFrame z wynikami testu (jak w mann_kendall_sen).
+    """
+    if seasonal and freq != 'ME':
+        raise ValueError("Wariant sezonowy wymaga średnich miesięcznych (freq='ME').")
+
+    df_agg = aggregate_for_trend(df, freq=freq, by_city=by_city)
+    return mann_kendall_sen(df_agg, alpha=alpha, seasonal=seasonal)
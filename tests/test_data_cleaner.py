@@ -5,6 +5,8 @@ import numpy as np
 
 # importujemy funkcje które chcemy testować 
 from data_cleaner import (
+    delete_rows,
+    split_sheet_metadata,
     normalize_dataframe,
     filter_common_stations,
     combine_dataframes,
@@ -97,3 +99,61 @@ def test_fix_midnight_dates():
     assert fixed.index[0] == pd.to_datetime("2024-01-01").date()
     # usunięty czas
     assert fixed.index[1] == pd.to_datetime("2024-01-02").date()
+
+
+def test_delete_rows_skips_missing_labels():
+    # sprawdzamy, czy delete_rows usuwa istniejące wiersze, a brakujące pomija bez błędu
+    df = pd.DataFrame({"A": [1, 2, 3]}, index=["Wskaźnik", "Jednostka", "x"])
+
+    result = delete_rows(2024, df, ["Wskaźnik", "Kod stanowiska", "Jednostka"])
+
+    assert list(result.index) == ["x"]
+
+
+def test_split_sheet_metadata_detects_layouts():
+    # sprawdzamy, czy układ arkusza jest rozpoznawany automatycznie dla formatu z 2015 roku
+    # (nagłówek w pierwszym wierszu) i nowszego (wiersz 'Nr' nad nagłówkiem),
+    # a metadane stacji trafiają do osobnej tabeli
+
+    raw_2015 = pd.DataFrame([
+        ["Kod stacji", "S1", "S2"],
+        ["Wskaźnik", "PM2.5", "PM2.5"],
+        ["Czas uśredniania", "1g", "1g"],
+        [pd.Timestamp("2015-01-01 01:00"), 10.5, 20],
+        [pd.Timestamp("2015-01-01 02:00"), 11, None],
+    ])
+    raw_2018 = pd.DataFrame([
+        ["Nr", 1, 2],
+        ["Kod stacji", "S1", "S2"],
+        ["Wskaźnik", "PM2.5", "PM2.5"],
+        ["Czas uśredniania", "1g", "1g"],
+        ["Jednostka", "ug/m3", "ug/m3"],
+        ["Czas pomiaru", "S1-PM2.5-1g", "S2-PM2.5-1g"],
+        [pd.Timestamp("2018-01-01 01:00"), "43,01", "5,38"],
+    ])
+
+    data_2015, meta_2015 = split_sheet_metadata(raw_2015)
+    data_2018, meta_2018 = split_sheet_metadata(raw_2018)
+
+    # w danych zostają tylko pomiary, z datami w indeksie
+    assert list(data_2015.columns) == ["S1", "S2"]
+    assert isinstance(data_2015.index, pd.DatetimeIndex)
+    assert len(data_2015) == 2
+    assert data_2015.loc["2015-01-01 01:00", "S1"] == 10.5
+    assert len(data_2018) == 1
+
+    # metadane: stacja w wierszu, 'Czas pomiaru' z 2018 to w rzeczywistości kod stanowiska
+    assert meta_2015.loc["S1", "Czas uśredniania"] == "1g"
+    assert meta_2018.loc["S2", "Jednostka"] == "ug/m3"
+    assert meta_2018.loc["S2", "Kod stanowiska"] == "S2-PM2.5-1g"
+
+    # arkusz z oboma wierszami: 'Kod stanowiska' zostaje jedną kolumną
+    raw_both = pd.DataFrame([
+        ["Kod stacji", "S1"],
+        ["Kod stanowiska", "S1-PM2.5-1g"],
+        ["Czas pomiaru", "S1-PM2.5-24g"],
+        [pd.Timestamp("2019-01-01 01:00"), 7.5],
+    ])
+    _, meta_both = split_sheet_metadata(raw_both)
+    assert list(meta_both.columns) == ["Kod stanowiska", "Czas pomiaru"]
+    assert meta_both.loc["S1", "Kod stanowiska"] == "S1-PM2.5-1g"
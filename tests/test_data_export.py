@@ -0,0 +1,105 @@
+import sqlite3
+
+import pandas as pd
+import numpy as np
+import pytest
+
+# importujemy funkcje które chcemy testować
+from data_cleaner import fix_midnight_dates
+from data_export import export_to_sqlite, read_city_range
+
+
+def test_export_and_read_city_range(tmp_path):
+    # sprawdzamy, czy dane zapisane do bazy SQLite da się odczytać z powrotem
+    # w tym samym układzie (MultiIndex Kod stacji / Miejscowość) oraz czy
+    # tabele z agregatami dobowymi mają poprawne średnie
+
+    columns = pd.MultiIndex.from_tuples(
+        [("MzWarA", "Warszawa"), ("MzWarB", "Warszawa"), ("SlKatA", "Katowice")],
+        names=["Kod stacji", "Miejscowość"]
+    )
+    df = pd.DataFrame(
+        [
+            [10.0, 20.0, 30.0],
+            [20.0, np.nan, 40.0],
+            [30.0, 40.0, 50.0],
+        ],
+        index=pd.to_datetime([
+            "2024-01-01 01:00",
+            "2024-01-01 02:00",
+            "2024-01-02 01:00",
+        ]),
+        columns=columns
+    )
+    df_meta = pd.DataFrame(
+        {"Miejscowość": ["Warszawa", "Warszawa", "Katowice"]},
+        index=pd.Index(["MzWarA", "MzWarB", "SlKatA"], name="Kod stacji")
+    )
+    db_path = tmp_path / "pm25.db"
+
+    # stara zawartość pliku ma zostać w całości podmieniona
+    export_to_sqlite(df.iloc[:1], df_meta, db_path)
+    inserted = export_to_sqlite(df, df_meta, db_path, batch_size=2)
+
+    # jeden pomiar był pusty, więc nie trafia do bazy
+    assert inserted == 8
+    # po eksporcie nie zostają pliki tymczasowe
+    assert [p.name for p in tmp_path.iterdir()] == ["pm25.db"]
+
+    result = read_city_range(db_path, "Warszawa", "2024-01-01", "2024-01-01 23:59:59")
+
+    # tylko stacje z Warszawy i tylko pierwszy dzień
+    assert list(result.columns) == [("MzWarA", "Warszawa"), ("MzWarB", "Warszawa")]
+    assert len(result) == 2
+    assert result.loc["2024-01-01 02:00", ("MzWarA", "Warszawa")] == 20.0
+    assert np.isnan(result.loc["2024-01-01 02:00", ("MzWarB", "Warszawa")])
+
+    # średnia dobowa dla MzWarA z pierwszego dnia to (10 + 20) / 2
+    with sqlite3.connect(db_path) as conn:
+        mean = conn.execute(
+            "SELECT mean FROM daily_means WHERE station = 'MzWarA' AND day = '2024-01-01'"
+        ).fetchone()[0]
+    assert mean == 15.0
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_export_failure_keeps_existing_database(tmp_path):
+    # sprawdzamy, czy przerwany eksport nie niszczy wcześniej zapisanej bazy
+    df = pd.DataFrame({"S1": [1.0, 2.0]}, index=pd.to_datetime(["2024-01-01 01:00", "2024-01-01 02:00"]))
+    df_meta = pd.DataFrame({"Miejscowość": ["Warszawa"]}, index=pd.Index(["S1"], name="Kod stacji"))
+    db_path = tmp_path / "pm25.db"
+    export_to_sqlite(df, df_meta, db_path)
+
+    # indeks, którego nie da się zamienić na daty - eksport przerywa się w trakcie wstawiania
+    with pytest.raises(ValueError):
+        export_to_sqlite(df.set_axis(["x", "y"]), df_meta, db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM measurements").fetchone()[0] == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["pm25.db"]
+
+
+def test_export_rejects_daily_index_and_keeps_all_city_stations(tmp_path):
+    # sprawdzamy, czy ramka po fix_midnight_dates (24 wiersze z tą samą datą) jest
+    # odrzucana zamiast po cichu zapisać i uśrednić pomiary godzinowe, oraz czy
+    # odczyt zwraca wszystkie stacje miasta, nawet bez pomiarów w zakresie
+    index = pd.date_range("2024-01-01 01:00", periods=48, freq="h")
+    df = pd.DataFrame({"S1": np.arange(48.0), "S2": np.nan}, index=index)
+    df.loc[index[-1], "S2"] = 5.0
+    df_meta = pd.DataFrame(
+        {"Miejscowość": ["Warszawa", "Warszawa"]},
+        index=pd.Index(["S1", "S2"], name="Kod stacji")
+    )
+    db_path = tmp_path / "pm25.db"
+
+    with pytest.raises(ValueError):
+        export_to_sqlite(fix_midnight_dates(df), df_meta, db_path)
+    assert not db_path.exists()
+
+    assert export_to_sqlite(df, df_meta, db_path) == 49
+    result = read_city_range(db_path, "Warszawa", "2024-01-01", "2024-01-01 23:59:59")
+
+    # wszystkie godziny z pierwszego dnia, S2 nie ma tam pomiarów, ale jest w kolumnach
+    assert len(result) == 23
+    assert list(result.columns) == [("S1", "Warszawa"), ("S2", "Warszawa")]
+    assert result[("S2", "Warszawa")].isna().all()
@@ -0,0 +1,90 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+# importujemy funkcje które chcemy testować oraz ich wersje szeregowe
+from data_parallel import (
+    create_pool,
+    share_stations,
+    release_stations,
+    parallel_daily_exceedances,
+    parallel_monthly_city_stats,
+    parallel_heatmap_data
+)
+from data_statistics import (
+    calculate_daily_exceedances,
+    calculate_monthly_city_stats,
+    prepare_heatmap_data
+)
+
+
+def make_data():
+    # dane godzinowe z dwóch lat dla 5 stacji w 3 miastach (z brakami)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01 01:00", "2024-12-31 23:00", freq="h")
+    columns = pd.MultiIndex.from_tuples(
+        [("S1", "Warszawa"), ("S2", "Katowice"), ("S3", "Warszawa"),
+         ("S4", "Kraków"), ("S5", "Katowice")],
+        names=["Kod stacji", "Miejscowość"]
+    )
+    values = rng.gamma(2.0, 10.0, size=(len(index), len(columns)))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def test_parallel_results_identical_to_serial():
+    # sprawdzamy, czy wersje równoległe (podział stacji na części i pula procesów)
+    # dają dokładnie ten sam wynik co zwykłe funkcje z data_statistics
+    df = make_data()
+
+    pd.testing.assert_frame_equal(
+        parallel_daily_exceedances(df, n_workers=2),
+        calculate_daily_exceedances(df)
+    )
+    # dane tekstowe (np. przed normalize_dataframe) idą ścieżką z konwersją kolumn
+    pd.testing.assert_frame_equal(
+        parallel_daily_exceedances(df.astype(object), n_workers=3),
+        calculate_daily_exceedances(df.astype(object))
+    )
+
+    # Kraków nie jest żądany (jego stacje nie są liczone), Gdańska nie ma w danych
+    cities = ["Warszawa", "Gdańsk", "Katowice"]
+    expected = calculate_monthly_city_stats(df, cities, [2023, 2024])
+    result = parallel_monthly_city_stats(df, cities, [2023, 2024], n_workers=2)
+    assert list(result.keys()) == list(expected.keys())
+    for key in expected:
+        pd.testing.assert_series_equal(result[key], expected[key])
+
+    pd.testing.assert_frame_equal(
+        parallel_heatmap_data(df, [2024], n_workers=2),
+        prepare_heatmap_data(df, [2024])
+    )
+
+
+def test_parallel_shared_stations_and_reused_pool():
+    # sprawdzamy, czy dane przeniesione raz do pamięci współdzielonej i jedna pula
+    # użyta w kilku wywołaniach dają te same wyniki co wersje szeregowe
+    df = make_data()
+    stations = share_stations(df.astype(object), n_workers=2)
+    try:
+        with create_pool(2) as pool:
+            pd.testing.assert_frame_equal(
+                parallel_daily_exceedances(stations, n_workers=2, pool=pool),
+                calculate_daily_exceedances(df)
+            )
+            pd.testing.assert_frame_equal(
+                parallel_heatmap_data(stations, [2023, 2024], n_workers=2, pool=pool),
+                prepare_heatmap_data(df, [2023, 2024])
+            )
+            result = parallel_monthly_city_stats(stations, ["Katowice"], [2024], n_workers=2, pool=pool)
+            expected = calculate_monthly_city_stats(df, ["Katowice"], [2024])
+            pd.testing.assert_series_equal(result[("Katowice", 2024)], expected[("Katowice", 2024)])
+    finally:
+        release_stations(stations)
+
+
+def test_parallel_monthly_city_stats_rejects_text_input():
+    # wersja szeregowa nie zamienia tekstu na liczby, więc równoległa też go nie przyjmuje
+    df = make_data().astype(str)
+    with pytest.raises(TypeError):
+        parallel_monthly_city_stats(df, ["Warszawa"], [2024], n_workers=2)
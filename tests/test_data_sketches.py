@@ -0,0 +1,71 @@
+import pandas as pd
+import numpy as np
+
+# importujemy funkcje które chcemy testować
+from data_sketches import (
+    add_values,
+    stream_daily_sketches,
+    merge_sketch_sets,
+    yearly_percentiles,
+    sketches_to_json,
+    sketches_from_json
+)
+
+
+def make_hourly():
+    # dane godzinowe z dwóch lat dla dwóch stacji
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2023-01-01 01:00", "2024-12-31 23:00", freq="h")
+    values = rng.gamma(2.0, 12.0, size=(len(index), 2))
+    return pd.DataFrame(values, index=index, columns=["S1", "S2"])
+
+
+def test_sketch_percentiles_within_error_bound():
+    # sprawdzamy, czy percentyl 90.4 średnich dobowych ze szkicu mieści się
+    # w zadeklarowanym błędzie względnym względem dokładnego wyniku
+    # i czy podział danych na fragmenty w środku dnia nie zmienia wyniku
+    df = make_hourly()
+    alpha = 0.01
+
+    whole = yearly_percentiles(stream_daily_sketches([df], alpha=alpha))
+    # fragmenty kończą się w środku dnia
+    chunks = [df.iloc[:1000], df.iloc[1000:9000], df.iloc[9000:]]
+    streamed = yearly_percentiles(stream_daily_sketches(chunks, alpha=alpha))
+    pd.testing.assert_frame_equal(whole, streamed)
+
+    daily = df.resample("D").mean()
+    for year in [2023, 2024]:
+        for station in ["S1", "S2"]:
+            exact = np.quantile(daily.loc[str(year), station], 0.904, method="lower")
+            approx = whole.loc[("srednia_dobowa", year), station]
+            assert abs(approx - exact) <= alpha * exact
+
+
+def test_sketches_merge_and_json_round_trip():
+    # sprawdzamy, czy szkice policzone osobno dla dwóch części danych da się zapisać
+    # do JSON-a, odczytać i scalić, a wynik jest taki sam jak przy jednym przebiegu
+    df = make_hourly()
+
+    all_data = stream_daily_sketches([df])
+    # podział w połowie 2023 roku - szkice dla 2023 trzeba scalić
+    part_a = sketches_from_json(sketches_to_json(stream_daily_sketches([df.loc[:"2023-06-30"]])))
+    part_b = sketches_from_json(sketches_to_json(stream_daily_sketches([df.loc["2023-07-01":]])))
+
+    merged = merge_sketch_sets(part_a, part_b)
+
+    assert merged == all_data
+    pd.testing.assert_frame_equal(yearly_percentiles(merged), yearly_percentiles(all_data))
+
+
+def test_merge_sketch_sets_does_not_share_sketches():
+    # sprawdzamy, czy dopisanie wartości do scalonego zbioru nie zmienia szkiców wejściowych
+    df = make_hourly()
+    part_2023 = stream_daily_sketches([df.loc["2023"]])
+    part_2024 = stream_daily_sketches([df.loc["2024"]])
+    count_before = part_2023[("srednia_dobowa", "S1", 2023)]["count"]
+
+    merged = merge_sketch_sets(part_2023, part_2024)
+    add_values(merged[("srednia_dobowa", "S1", 2023)], [1.0, 2.0])
+
+    assert part_2023[("srednia_dobowa", "S1", 2023)]["count"] == count_before
+    assert merged[("srednia_dobowa", "S1", 2023)]["count"] == count_before + 2
@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+
 import pandas as pd
 import numpy as np
 
@@ -28,4 +32,31 @@ def test_calculate_daily_exceedances_simple():
     result = calculate_daily_exceedances(df)
 
     # W 2024 roku powinien być dokładnie 1 dzień z przekroczeniem normy
-    assert result.loc[2024, "PM25"] == 1
\ No newline at end of file
+    assert result.loc[2024, "PM25"] == 1
+
+
+def test_import_without_plotting_stack():
+    # sprawdzamy w osobnym procesie (czysty start, jak w procesie roboczym), że import
+    # data_statistics nie ładuje matplotlib ani seaborn i że import mieści się w limicie czasu;
+    # biblioteki do wykresów mają się załadować dopiero przy pierwszym wywołaniu plot_*
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import data_statistics\n"
+        "elapsed = time.perf_counter() - start\n"
+        "assert 'matplotlib' not in sys.modules, 'matplotlib zaimportowany przy starcie'\n"
+        "assert 'seaborn' not in sys.modules, 'seaborn zaimportowany przy starcie'\n"
+        "data_statistics.plot_city_comparison({})\n"
+        "assert 'matplotlib' in sys.modules\n"
+        "print(f'{elapsed:.3f}')\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONPATH=root)
+
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=root,
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    # import zajmuje ok. 0.3 s (głównie pandas) - limit z dużym zapasem na wolne maszyny CI
+    elapsed = float(result.stdout.splitlines()[-1])
+    assert elapsed < 3.0, f"import data_statistics trwał {elapsed:.3f} s"
@@ -0,0 +1,56 @@
+import pandas as pd
+import numpy as np
+
+# importujemy funkcje które chcemy testować
+from data_trends import mann_kendall_sen, calculate_trends
+
+
+def test_mann_kendall_sen_matches_manual_calculation():
+    # sprawdzamy, czy zwektoryzowany test Manna-Kendalla i nachylenie Sena
+    # dają to samo co ręczna pętla po parach (z remisami i brakami danych)
+    index = pd.date_range("2015-12-31", periods=8, freq="YE")
+    df = pd.DataFrame({
+        "S1": [30.0, 28.0, 28.0, 25.0, np.nan, 22.0, 23.0, 20.0],
+        "S2": [10.0, 12.0, 11.0, 13.0, 13.0, 14.0, 15.0, 16.0],
+    }, index=index)
+
+    result = mann_kendall_sen(df)
+
+    for col in df.columns:
+        x = df[col].dropna()
+        years = x.index.year.to_numpy()
+        vals = x.to_numpy()
+        s = 0
+        slopes = []
+        for i in range(len(vals)):
+            for j in range(i + 1, len(vals)):
+                s += np.sign(vals[j] - vals[i])
+                slopes.append((vals[j] - vals[i]) / (years[j] - years[i]))
+        assert result.loc[col, "S"] == s
+        assert np.isclose(result.loc[col, "nachylenie"], np.median(slopes))
+
+    # S1 maleje, S2 rośnie
+    assert result.loc["S1", "trend"] == "malejący"
+    assert result.loc["S2", "trend"] == "rosnący"
+
+
+def test_calculate_trends_seasonal():
+    # sprawdzamy wariant sezonowy: dane godzinowe z wyraźnym cyklem rocznym
+    # i spadkiem o 1 µg/m³ na rok powinny dać nachylenie -1 dla każdego miasta
+    index = pd.date_range("2015-01-01", "2020-12-31 23:00", freq="6h")
+    years = index.year - 2015
+    season = 20 * np.cos(2 * np.pi * index.month / 12)
+    columns = pd.MultiIndex.from_tuples(
+        [("S1", "Warszawa"), ("S2", "Katowice")],
+        names=["Kod stacji", "Miejscowość"]
+    )
+    df = pd.DataFrame(
+        np.column_stack([40 + season - years, 50 + season - years]),
+        index=index, columns=columns
+    )
+
+    result = calculate_trends(df, freq="ME", by_city=True, seasonal=True)
+
+    assert list(result.index) == ["Katowice", "Warszawa"]
+    assert np.allclose(result["nachylenie"], -1.0)
+    assert (result["trend"] == "malejący").all()